@@ -0,0 +1,47 @@
+-- Migraciones para las tablas consultadas por el DAG (src/)
+-- CONCURRENTLY no puede ejecutarse dentro de una transacción: correr cada sentencia por separado.
+
+-- 1. Eliminar duplicados previos de regulations antes de crear regulations_dedup_idx.
+-- La deduplicación anterior comparaba created_at como texto y nunca coincidía, así que
+-- las bases existentes tienen registros repetidos y el índice único no se puede crear.
+-- Se conserva el menor id por clave y los componentes de los duplicados se repuntan a él
+-- (y se eliminan los que quedan repetidos). Las filas con título, fecha o entidad nulos
+-- no se tocan: el índice único no las considera iguales.
+BEGIN;
+
+CREATE TEMP TABLE _regulations_dups ON COMMIT DROP AS
+SELECT id, keep_id
+FROM (
+  SELECT id,
+         min(id) OVER (PARTITION BY title, created_at, entity, COALESCE(external_link, '')) AS keep_id
+  FROM regulations
+  WHERE title IS NOT NULL AND created_at IS NOT NULL AND entity IS NOT NULL
+) ranked
+WHERE id <> keep_id;
+
+UPDATE regulations_component c
+SET regulations_id = d.keep_id
+FROM _regulations_dups d
+WHERE c.regulations_id = d.id;
+
+DELETE FROM regulations_component c
+USING regulations_component k
+WHERE c.regulations_id = k.regulations_id
+  AND c.components_id IS NOT DISTINCT FROM k.components_id
+  AND c.id > k.id
+  AND c.regulations_id IN (SELECT keep_id FROM _regulations_dups);
+
+DELETE FROM regulations r
+USING _regulations_dups d
+WHERE r.id = d.id;
+
+COMMIT;
+
+-- 2. Volver a aplicar configs/schema.sql para crear regulations_dedup_idx
+--    (INSERT ... ON CONFLICT en escritura.py depende de él):
+--    psql -f configs/schema.sql
+
+-- 3. Índice para obtener la fecha más reciente por entidad (check_for_new_content):
+-- ORDER BY created_at DESC LIMIT 1 lee una sola hoja del índice
+CREATE INDEX CONCURRENTLY IF NOT EXISTS regulations_entity_created_idx
+  ON dapper_regulations_regulations (entity, created_at DESC);
@@ -14,6 +14,10 @@ CREATE TABLE IF NOT EXISTS regulations (
   classification_id INTEGER
 );
 
+-- Clave natural para deduplicar en la inserción (ON CONFLICT DO NOTHING)
+CREATE UNIQUE INDEX IF NOT EXISTS regulations_dedup_idx
+  ON regulations (title, created_at, entity, COALESCE(external_link, ''));
+
 CREATE TABLE IF NOT EXISTS regulations_component (
   id SERIAL PRIMARY KEY,
   regulations_id INTEGER REFERENCES regulations(id),
@@ -43,12 +43,13 @@ def ani_pipeline():
         num_pages=int(num_pages_to_scrape)
         df=run_extraction(num_pages,verbose)
         print(f"Total de registros obtenidos: {len(df)}") 
-        return  df.to_dict(orient="records")
+        # Formato columnar: más barato de serializar y de reconstruir que una lista de dicts
+        return  df.to_dict(orient="list")
 
     @task
-    def validar_datos(records):
+    def validar_datos(columns):
         print(f"\nVALIDACIÓN ")
-        df = pd.DataFrame(records)
+        df = pd.DataFrame(columns)
         df_valid, reporte = run_validation(df, ENTITY_VALUE)
     
         # Mostrar el reporte de validación
@@ -60,9 +61,9 @@ def ani_pipeline():
 
 
     @task 
-    def escribir_datos(records):
+    def escribir_datos(columns):
         print("\n ESCRITURA ")
-        df = pd.DataFrame(records)
+        df = pd.DataFrame(columns)
         if df.empty:
             inserted, message = (0, 'No hay normas para escribir')
         else:
@@ -1,13 +1,21 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 import pandas as pd
 from datetime import datetime
 import re
 import psycopg2
+from psycopg2.extras import execute_values
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import json
 import os
+import io
+import asyncio
+import aiohttp
+from functools import lru_cache
 from typing import Dict, Any
 
 # Configuración de AWS Secrets Manager
@@ -28,12 +36,50 @@ CLASSIFICATION_KEYWORDS = {
 
 DEFAULT_RTYPE_ID = 14
 
-# Cliente de Secrets Manager
-secrets_client = boto3.client('secretsmanager', region_name=REGION_NAME)
+# Regex con todas las palabras clave: una sola pasada sobre el título
+CLASSIFICATION_RE = re.compile('|'.join(map(re.escape, CLASSIFICATION_KEYWORDS)), re.IGNORECASE)
 
+# Columnas de cada registro de norma (orden de la tabla regulations)
+NORMA_COLUMNS = [
+    'created_at', 'update_at', 'is_active', 'title', 'gtype', 'entity',
+    'external_link', 'rtype_id', 'summary', 'classification_id',
+]
+
+# Tabla de traducción para eliminar comillas y regex de espacios en blanco
+QUOTE_TRANS = str.maketrans('', '', '\u201C\u201D\u2018\u2019\u00AB\u00BB\u201E\u201A\u2039\u203A"\'´`\u2032\u2033')
+WS_RE = re.compile(r'\s+')
+
+# XPaths precompilados para recorrer la tabla de normas
+TITLE_CELL_XPATH = etree.XPath('./td[contains(@class, "views-field-title")]')
+LINK_XPATH = etree.XPath('.//a')
+SUMMARY_CELL_XPATH = etree.XPath('./td[contains(@class, "views-field-body")]')
+FECHA_CELL_XPATH = etree.XPath('./td[contains(@class, "views-field-field-fecha--1")]')
+FECHA_SPAN_XPATH = etree.XPath('.//span[contains(@class, "date-display-single")]')
+
+# Cliente de Secrets Manager (reintentos y timeout acotados para el arranque en frío)
+secrets_client = boto3.client(
+    'secretsmanager',
+    region_name=REGION_NAME,
+    config=Config(retries={'max_attempts': 2}, connect_timeout=2)
+)
+
+# Cabeceras HTTP comunes para requests y aiohttp
+HTTP_HEADERS = {'Accept-Encoding': 'gzip, deflate', 'User-Agent': 'ani-etl/1.0'}
+
+# Sesión HTTP compartida para reutilizar conexiones TCP/TLS entre páginas
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+))
+SESSION.headers.update(HTTP_HEADERS)
+
+@lru_cache(maxsize=1)
 def get_secret():
     """
     Recupera las credenciales de la base de datos de AWS Secrets Manager.
+    Se cachea durante la vida del contenedor (invocaciones en caliente).
     """
     try:
         get_secret_value_response = secrets_client.get_secret_value(SecretId=SECRET_NAME)
@@ -78,52 +124,73 @@ class DatabaseManager:
         self.cursor.execute(query, params)
         return self.cursor.fetchall()
 
-    def bulk_insert(self, df, table_name):
+    def bulk_insert(self, df, table_name, returning=None, on_conflict=None, commit=True):
+        """
+        Inserta el DataFrame con execute_values.
+        
+        `on_conflict` es una cláusula ON CONFLICT opcional que se agrega al INSERT.
+        Con `commit=False` la transacción queda abierta para que el llamador la confirme.
+        Si se indica `returning` (p. ej. 'id'), retorna (cantidad, valores_retornados);
+        en caso contrario retorna la cantidad de filas insertadas.
+        """
         if not self.connection or not self.cursor:
             raise Exception("Database not connected")
         
         try:
-            df = df.astype(object).where(pd.notnull(df), None)
             columns_for_sql = ", ".join([f'"{col}"' for col in df.columns])
-            placeholders = ", ".join(["%s"] * len(df.columns))
             
-            insert_query = f"INSERT INTO {table_name} ({columns_for_sql}) VALUES ({placeholders})"
-            records_to_insert = [tuple(x) for x in df.values]
+            # execute_values agrupa las filas en un solo INSERT multi-VALUES por página
+            insert_query = f"INSERT INTO {table_name} ({columns_for_sql}) VALUES %s"
+            if on_conflict:
+                insert_query += f" {on_conflict}"
+            
+            # NaN/NaT -> None fila por fila, sin copiar el DataFrame completo a dtype object
+            # (v != v solo es cierto para NaN)
+            records_to_insert = [
+                tuple(None if v is None or v is pd.NaT or (isinstance(v, float) and v != v) else v for v in row)
+                for row in df.itertuples(index=False, name=None)
+            ]
             
-            self.cursor.executemany(insert_query, records_to_insert)
-            self.connection.commit()
+            if returning:
+                insert_query += f" RETURNING {returning}"
+                result = execute_values(self.cursor, insert_query, records_to_insert, page_size=1000, fetch=True)
+                if commit:
+                    self.connection.commit()
+                return len(result), [r[0] for r in result]
+            
+            execute_values(self.cursor, insert_query, records_to_insert, template=None, page_size=1000)
+            if commit:
+                self.connection.commit()
             return len(df)
         except Exception as e:
             self.connection.rollback()
             raise Exception(f"Error inserting into {table_name}: {str(e)}")
         
+def element_text(element):
+    """
+    Texto de un elemento como get_text(strip=True) de BeautifulSoup: cada nodo de
+    texto recortado y unidos sin separador
+    """
+    return ''.join(text.strip() for text in element.itertext())
+
 # Función eliminar comillas
 def clean_quotes(text):
     if not text:
         return text
-    quotes_map = {
-        '\u201C': '', '\u2018': '', '\u2019': '', '\u00AB': '', '\u00BB': '',
-        '\u201E': '', '\u201A': '', '\u2039': '', '\u203A': '', '"': '',
-        "'": '', '´': '', '`': '', '′': '', '″': '',
-    }
-    cleaned_text = text
-    for quote_char, replacement in quotes_map.items():
-        cleaned_text = cleaned_text.replace(quote_char, replacement)
-    quotes_pattern = r'["\'\u201C\u201D\u2018\u2019\u00AB\u00BB\u201E\u201A\u2039\u203A\u2032\u2033]'
-    cleaned_text = re.sub(quotes_pattern, '', cleaned_text)
-    cleaned_text = cleaned_text.strip()
-    cleaned_text = ' '.join(cleaned_text.split())
-    return cleaned_text
+    return WS_RE.sub(' ', text.translate(QUOTE_TRANS)).strip()
 
 # Obtener el rtype_id basado en el título del documento
 def get_rtype_id(title):
     """
     Obtiene el rtype_id basado en el título del documento.
+    Si aparecen varias palabras clave gana la primera de CLASSIFICATION_KEYWORDS.
     """
-    title_lower = title.lower()
+    found = {match.lower() for match in CLASSIFICATION_RE.findall(title)}
+    if not found:
+        return DEFAULT_RTYPE_ID
     
     for keyword, rtype_id in CLASSIFICATION_KEYWORDS.items():
-        if keyword in title_lower:
+        if keyword in found:
             return rtype_id
     
     return DEFAULT_RTYPE_ID
@@ -151,6 +218,26 @@ def normalize_datetime(dt):
     
     return dt
 
+def _now_str():
+    """
+    Fecha y hora actual como 'YYYY-MM-DD HH:MM:SS' (isoformat es más rápido que strftime).
+    """
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+@lru_cache(maxsize=1024)
+def parse_date_str(value):
+    """
+    Convierte 'YYYY-MM-DD HH:MM:SS' o 'YYYY-MM-DD' a datetime sin timezone.
+    Retorna None si el formato no es reconocido.
+    """
+    try:
+        return normalize_datetime(datetime.strptime(value, '%Y-%m-%d %H:%M:%S'))
+    except ValueError:
+        try:
+            return normalize_datetime(datetime.strptime(value.split()[0], '%Y-%m-%d'))
+        except (ValueError, IndexError):
+            return None
+
 def extract_title_and_link(row, norma_data, verbose, row_num):
     """
     Extrae título y enlace de una fila
@@ -158,20 +245,22 @@ def extract_title_and_link(row, norma_data, verbose, row_num):
     Returns:
         bool: True si se extrajo correctamente, False si debe saltarse
     """
-    title_cell = row.find('td', class_='views-field views-field-title')
-    if not title_cell:
+    title_cells = TITLE_CELL_XPATH(row)
+    if not title_cells:
         if verbose:
             print(f"No se encontró celda de título en la fila {row_num}. Saltando.")
         return False
     
-    title_link = title_cell.find('a')
-    if not title_link:
+    title_links = LINK_XPATH(title_cells[0])
+    if not title_links:
         if verbose:
             print(f"No se encontró enlace en la fila {row_num}. Saltando.")
         return False
     
+    title_link = title_links[0]
+    
     # Procesar título
-    raw_title = title_link.get_text(strip=True)
+    raw_title = element_text(title_link)
     cleaned_title = clean_quotes(raw_title)
     
     # Validar longitud del título
@@ -202,9 +291,9 @@ def extract_summary(row, norma_data):
     """
     Extrae el resumen/descripción de una fila
     """
-    summary_cell = row.find('td', class_='views-field views-field-body')
-    if summary_cell:
-        raw_summary = summary_cell.get_text(strip=True)
+    summary_cells = SUMMARY_CELL_XPATH(row)
+    if summary_cells:
+        raw_summary = element_text(summary_cells[0])
         cleaned_summary = clean_quotes(raw_summary)
         formatted_summary = cleaned_summary.capitalize()
         norma_data['summary'] = formatted_summary
@@ -218,24 +307,16 @@ def extract_creation_date(row, norma_data, verbose, row_num):
     Returns:
         bool: True si se extrajo correctamente, False si debe saltarse
     """
-    fecha_cell = row.find('td', class_='views-field views-field-field-fecha--1')
-    if fecha_cell:
-        fecha_span = fecha_cell.find('span', class_='date-display-single')
-        if fecha_span:
-            created_at_raw = fecha_span.get('content', fecha_span.get_text(strip=True))
-            # Procesar diferentes formatos de fecha
-            if 'T' in created_at_raw:
-                norma_data['created_at'] = created_at_raw.split('T')[0]
-            elif '/' in created_at_raw:
-                try:
-                    day, month, year = created_at_raw.split('/')
-                    norma_data['created_at'] = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                except:
-                    norma_data['created_at'] = created_at_raw
-            else:
-                norma_data['created_at'] = created_at_raw
+    fecha_cells = FECHA_CELL_XPATH(row)
+    if fecha_cells:
+        fecha_cell = fecha_cells[0]
+        fecha_spans = FECHA_SPAN_XPATH(fecha_cell)
+        if fecha_spans:
+            fecha_span = fecha_spans[0]
+            # El formato se normaliza por página en normalize_created_at
+            norma_data['created_at'] = fecha_span.get('content', element_text(fecha_span))
         else:
-            norma_data['created_at'] = fecha_cell.get_text(strip=True)
+            norma_data['created_at'] = element_text(fecha_cell)
     else:
         norma_data['created_at'] = None
     
@@ -247,6 +328,140 @@ def extract_creation_date(row, norma_data, verbose, row_num):
     
     return True
 
+def empty_columns():
+    """
+    Retorna un dict {columna: []} para acumular registros por columna
+    """
+    return {col: [] for col in NORMA_COLUMNS}
+
+def process_row(row, row_num, now_str, verbose=False):
+    """
+    Construye el registro de una fila de la tabla de normas
+    
+    Returns:
+        dict | None: Datos de la norma, o None si la fila debe saltarse
+    """
+    # Estructura base del registro
+    norma_data = {
+        'created_at': None,
+        'update_at': now_str,
+        'is_active': True,
+        'title': None,
+        'gtype': None,
+        'entity': ENTITY_VALUE,
+        'external_link': None,
+        'rtype_id': None,
+        'summary': None,
+        'classification_id': FIXED_CLASSIFICATION_ID,
+    }
+    
+    # Extraer datos
+    if not extract_title_and_link(row, norma_data, verbose, row_num):
+        return None
+    
+    extract_summary(row, norma_data)
+    
+    if not extract_creation_date(row, norma_data, verbose, row_num):
+        return None
+    
+    # Establecer rtype_id basado en título
+    norma_data['rtype_id'] = get_rtype_id(norma_data['title'])
+    
+    return norma_data
+
+def normalize_created_at(page_data, verbose=False):
+    """
+    Normaliza en bloque las fechas crudas de una página a 'YYYY-MM-DD'.
+    Acepta ISO ('YYYY-MM-DD' o 'YYYY-MM-DDTHH:MM:SS...') y 'DD/MM/YYYY';
+    las filas con fechas no reconocidas se descartan.
+    """
+    if not page_data['created_at']:
+        return page_data
+    
+    raw_dates = pd.Series(page_data['created_at'], dtype=object).str.split('T').str[0]
+    dates = pd.to_datetime(raw_dates, format='%Y-%m-%d', errors='coerce').fillna(
+        pd.to_datetime(raw_dates, format='%d/%m/%Y', errors='coerce')
+    )
+    valid = dates.notna()
+    page_data['created_at'] = dates.dt.strftime('%Y-%m-%d').tolist()
+    
+    if not valid.all():
+        mask = valid.tolist()
+        if verbose:
+            print(f"Saltando {mask.count(False)} normas con fecha de creación no reconocida.")
+        page_data = {
+            col: [value for value, keep in zip(values, mask) if keep]
+            for col, values in page_data.items()
+        }
+    
+    return page_data
+
+def build_page_url(page_num):
+    """
+    Construye la URL de una página del listado de normas
+    """
+    if page_num == 0:
+        return URL_BASE
+    return f"{URL_BASE}&page={page_num}"
+
+def parse_page(source, page_num, verbose=False):
+    """
+    Parsea el HTML de una página de ANI de forma incremental
+    
+    Args:
+        source: Objeto tipo archivo con el HTML (stream de respuesta o BytesIO)
+        page_num (int): Número de página (para logs)
+        verbose (bool): Si mostrar logs detallados
+    
+    Returns:
+        dict: Datos extraídos por columna ({columna: lista_de_valores})
+    """
+    # Procesar filas (todas comparten la misma marca de actualización)
+    now_str = _now_str()
+    page_data = empty_columns()
+    found_tbody = False
+    i = 0
+    
+    # El sitio de ANI sirve UTF-8
+    for _, elem in etree.iterparse(source, events=('end',), tag=('tr', 'tbody'),
+                                   html=True, encoding='utf-8'):
+        # Solo interesa la primera tabla: se deja de leer al cerrar su tbody. Un tbody
+        # anidado (tabla dentro de una celda) cierra antes y no corta la lectura
+        if elem.tag == 'tbody':
+            if next(elem.iterancestors('tbody'), None) is None:
+                found_tbody = True
+                break
+            continue
+        
+        parent = elem.getparent()
+        if parent is None or parent.tag != 'tbody' or next(parent.iterancestors('tbody'), None) is not None:
+            # Las filas de tablas anidadas en una celda se conservan: son parte de su texto
+            if next(elem.iterancestors('td'), None) is None:
+                elem.clear()
+            continue
+        
+        i += 1
+        try:
+            norma_data = process_row(elem, i, now_str, verbose)
+            if norma_data:
+                for col in NORMA_COLUMNS:
+                    page_data[col].append(norma_data[col])
+        except Exception as e:
+            if verbose:
+                print(f"Error procesando fila {i} en página {page_num}: {str(e)}")
+        finally:
+            elem.clear()
+    
+    if not found_tbody:
+        if verbose:
+            print(f"No se encontró tabla en página {page_num}")
+        return empty_columns()
+    
+    if verbose:
+        print(f"Procesadas {i} filas en página {page_num}")
+    
+    return normalize_created_at(page_data, verbose)
+
 def scrape_page(page_num, verbose=False):
     """
     Scrapea una página específica de ANI
@@ -256,82 +471,67 @@ def scrape_page(page_num, verbose=False):
         verbose (bool): Si mostrar logs detallados
     
     Returns:
-        list: Lista de diccionarios con los datos extraídos
+        dict: Datos extraídos por columna ({columna: lista_de_valores})
     """
-    # Construir URL de la página
-    if page_num == 0:
-        page_url = URL_BASE
-    else:
-        page_url = f"{URL_BASE}&page={page_num}"
+    page_url = build_page_url(page_num)
     
     if verbose:
         print(f"Scrapeando página {page_num}: {page_url}")
     
     try:
-        # Realizar solicitud HTTP
-        response = requests.get(page_url, timeout=15)
-        response.raise_for_status()
-        
-        # Parsear HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        tbody = soup.find('tbody')
-        
-        if not tbody:
-            if verbose:
-                print(f"No se encontró tabla en página {page_num}")
-            return []
-        
-        rows = tbody.find_all('tr')
-        if verbose:
-            print(f"Encontradas {len(rows)} filas en página {page_num}")
-        
-        # Procesar filas
-        page_data = []
-        for i, row in enumerate(rows, 1):
-            try:
-                # Estructura base del registro
-                norma_data = {
-                    'created_at': None,
-                    'update_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'is_active': True,
-                    'title': None,
-                    'gtype': None,
-                    'entity': ENTITY_VALUE,
-                    'external_link': None,
-                    'rtype_id': None,
-                    'summary': None,
-                    'classification_id': FIXED_CLASSIFICATION_ID,
-                }
-                
-                # Extraer datos
-                if not extract_title_and_link(row, norma_data, verbose, i):
-                    continue
-                
-                extract_summary(row, norma_data)
-                
-                if not extract_creation_date(row, norma_data, verbose, i):
-                    continue
-                
-                # Establecer rtype_id basado en título
-                norma_data['rtype_id'] = get_rtype_id(norma_data['title'])
-                
-                page_data.append(norma_data)
-                
-            except Exception as e:
-                if verbose:
-                    print(f"Error procesando fila {i} en página {page_num}: {str(e)}")
-                continue
-        
-        return page_data
+        # Realizar solicitud HTTP en modo streaming: las filas se parsean a medida que llegan
+        with SESSION.get(page_url, stream=True, timeout=15) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return parse_page(response.raw, page_num, verbose)
         
     except requests.RequestException as e:
         print(f"Error HTTP en página {page_num}: {e}")
-        return []
+        return empty_columns()
     except Exception as e:
         print(f"Error procesando página {page_num}: {e}")
-        return []
+        return empty_columns()
 
-def insert_regulations_component(db_manager, new_ids):
+async def fetch_page(session, page_num, verbose=False):
+    """
+    Descarga una página con aiohttp y la parsea (el parseo es síncrono)
+    
+    Returns:
+        dict: Datos extraídos por columna ({columna: lista_de_valores})
+    """
+    page_url = build_page_url(page_num)
+    
+    if verbose:
+        print(f"Scrapeando página {page_num}: {page_url}")
+    
+    try:
+        async with session.get(page_url) as response:
+            response.raise_for_status()
+            html = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error HTTP en página {page_num}: {e}")
+        return empty_columns()
+    
+    try:
+        return parse_page(io.BytesIO(html), page_num, verbose)
+    except Exception as e:
+        print(f"Error procesando página {page_num}: {e}")
+        return empty_columns()
+
+async def scrape_pages(page_nums, verbose=False):
+    """
+    Descarga y parsea varias páginas en paralelo sobre una sola sesión HTTP
+    
+    Returns:
+        list: Datos por columna de cada página, en el mismo orden de page_nums
+    """
+    connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=15)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers=HTTP_HEADERS) as session:
+        return await asyncio.gather(*[fetch_page(session, p, verbose) for p in page_nums])
+
+def insert_regulations_component(db_manager, new_ids, commit=True):
     """
     Inserta los componentes de las regulaciones.
     """
@@ -342,7 +542,7 @@ def insert_regulations_component(db_manager, new_ids):
         id_rows = pd.DataFrame(new_ids, columns=['regulations_id'])
         id_rows['components_id'] = 7
         
-        inserted_count = db_manager.bulk_insert(id_rows, 'regulations_component')
+        inserted_count = db_manager.bulk_insert(id_rows, 'regulations_component', commit=commit)
         return inserted_count, f"Successfully inserted {inserted_count} regulation components"
         
     except Exception as e:
@@ -351,28 +551,15 @@ def insert_regulations_component(db_manager, new_ids):
 def insert_new_records(db_manager, df, entity):
     """
     Inserta nuevos registros en la base de datos evitando duplicados.
-    Optimizada para velocidad y precisión.
+    La deduplicación contra la BD la resuelve Postgres con ON CONFLICT DO NOTHING
+    sobre el índice único regulations_dedup_idx (ver migrations.sql).
+    Regulaciones y componentes se confirman en una sola transacción.
     """
     regulations_table_name = 'regulations'
+    key_cols = ['title', 'created_at', 'external_link']
     
     try:
-        # 1. OBTENER REGISTROS EXISTENTES INCLUYENDO EXTERNAL_LINK
-        query = """
-            SELECT title, created_at, entity, COALESCE(external_link, '') as external_link 
-            FROM {} 
-            WHERE entity = %s
-        """.format(regulations_table_name)
-        
-        existing_records = db_manager.execute_query(query, (entity,))
-        
-        if not existing_records:
-            db_df = pd.DataFrame(columns=['title', 'created_at', 'entity', 'external_link'])
-        else:
-            db_df = pd.DataFrame(existing_records, columns=['title', 'created_at', 'entity', 'external_link'])
-        
-        print(f"Registros existentes en BD para {entity}: {len(db_df)}")
-        
-        # 2. PREPARAR DATAFRAME DE LA ENTIDAD
+        # 1. PREPARAR DATAFRAME DE LA ENTIDAD
         entity_df = df[df['entity'] == entity].copy()
         
         if entity_df.empty:
@@ -380,135 +567,52 @@ def insert_new_records(db_manager, df, entity):
         
         print(f"Registros a procesar para {entity}: {len(entity_df)}")
         
-        # 3. NORMALIZAR DATOS PARA COMPARACIÓN CONSISTENTE
-        # Normalizar created_at a string
-        if not db_df.empty:
-            db_df['created_at'] = db_df['created_at'].astype(str)
-            db_df['external_link'] = db_df['external_link'].fillna('').astype(str)
-            db_df['title'] = db_df['title'].astype(str).str.strip()
-        
-        entity_df['created_at'] = entity_df['created_at'].astype(str)
-        entity_df['external_link'] = entity_df['external_link'].fillna('').astype(str)
-        entity_df['title'] = entity_df['title'].astype(str).str.strip()
-        
-        # 4. IDENTIFICAR DUPLICADOS DE MANERA OPTIMIZADA
-        print("=== INICIANDO VALIDACIÓN DE DUPLICADOS OPTIMIZADA ===")
-        
-        if db_df.empty:
-            # Si no hay registros existentes, todos son nuevos
-            new_records = entity_df.copy()
-            duplicates_found = 0
-            print("No hay registros existentes, todos son nuevos")
-        else:
-            # Crear claves únicas para comparación super rápida
-            entity_df['unique_key'] = (
-                entity_df['title'] + '|' + 
-                entity_df['created_at'] + '|' + 
-                entity_df['external_link']
-            )
-            
-            db_df['unique_key'] = (
-                db_df['title'] + '|' + 
-                db_df['created_at'] + '|' + 
-                db_df['external_link']
-            )
-            
-            # Usar set para comparación O(1) - súper rápido
-            existing_keys = set(db_df['unique_key'])
-            entity_df['is_duplicate'] = entity_df['unique_key'].isin(existing_keys)
-            
-            new_records = entity_df[~entity_df['is_duplicate']].copy()
-            duplicates_found = len(entity_df) - len(new_records)
-            
-            # Log para debugging
-            if duplicates_found > 0:
-                print(f"Duplicados encontrados: {duplicates_found}")
-                duplicate_records = entity_df[entity_df['is_duplicate']]
-                print("Ejemplos de duplicados:")
-                for idx, row in duplicate_records.head(3).iterrows():
-                    print(f"  - {row['title'][:50]}... | {row['created_at']}")
-        
-        # 5. REMOVER DUPLICADOS INTERNOS DEL DATAFRAME
-        print(f"Antes de remover duplicados internos: {len(new_records)}")
-        new_records = new_records.drop_duplicates(
-            subset=['title', 'created_at', 'external_link'], 
-            keep='first'
-        )
-        internal_duplicates = len(entity_df) - duplicates_found - len(new_records)
+        # 2. REMOVER DUPLICADOS INTERNOS DEL DATAFRAME
+        new_records = entity_df.drop_duplicates(subset=key_cols, keep='first')
+        internal_duplicates = len(entity_df) - len(new_records)
         if internal_duplicates > 0:
             print(f"Duplicados internos removidos: {internal_duplicates}")
         
-        print(f"Después de remover duplicados internos: {len(new_records)}")
-        print(f"=== DUPLICADOS IDENTIFICADOS: {duplicates_found + internal_duplicates} ===")
+        print(f"Registros finales a insertar: {len(new_records)}")
         
-        if new_records.empty:
-            return 0, f"No new records found for entity {entity} after duplicate validation"
+        # 3. INSERTAR NUEVOS REGISTROS (los existentes se omiten en el servidor)
+        print(f"=== INSERTANDO {len(new_records)} REGISTROS ===")
         
-        # 6. LIMPIAR DATAFRAME ANTES DE INSERTAR
-        # Remover columnas auxiliares
-        columns_to_drop = ['unique_key', 'is_duplicate']
-        for col in columns_to_drop:
-            if col in new_records.columns:
-                new_records = new_records.drop(columns=[col])
+        # Una sola transacción sin esperar el fsync del WAL: la Lambda puede re-ejecutarse
+        db_manager.cursor.execute("SET LOCAL synchronous_commit = off")
         
-        print(f"Registros finales a insertar: {len(new_records)}")
+        # RETURNING id devuelve solo los IDs de las filas realmente insertadas
+        total_rows_processed, new_ids = db_manager.bulk_insert(
+            new_records,
+            regulations_table_name,
+            returning='id',
+            on_conflict="ON CONFLICT (entity, title, created_at, COALESCE(external_link, '')) DO NOTHING",
+            commit=False
+        )
+        duplicates_found = len(new_records) - total_rows_processed
         
-        # 7. INSERTAR NUEVOS REGISTROS
-        try:
-            print(f"=== INSERTANDO {len(new_records)} REGISTROS ===")
-            
-            total_rows_processed = db_manager.bulk_insert(new_records, regulations_table_name)
-            
-            if total_rows_processed == 0:
-                return 0, f"No records were actually inserted for entity {entity}"
-            
-            print(f"Registros insertados exitosamente: {total_rows_processed}")
-            
-        except Exception as insert_error:
-            print(f"Error en inserción: {insert_error}")
-            # Si es error de duplicados, algunos se escaparon
-            if "duplicate" in str(insert_error).lower() or "unique" in str(insert_error).lower():
-                print("Error de duplicados detectado - algunos registros ya existían")
-                return 0, f"Some records for entity {entity} were duplicates and skipped"
-            else:
-                raise insert_error
-        
-        # 8. OBTENER IDS DE REGISTROS INSERTADOS - MÉTODO OPTIMIZADO
-        print("=== OBTENIENDO IDS DE REGISTROS INSERTADOS ===")
-        
-        # Método simple y eficiente - obtener los últimos N IDs
-        new_ids_query = f"""
-            SELECT id FROM {regulations_table_name}
-            WHERE entity = %s 
-            ORDER BY id DESC
-            LIMIT %s
-        """
+        print(f"Duplicados omitidos por la BD: {duplicates_found}")
         
-        new_ids_result = db_manager.execute_query(
-            new_ids_query, 
-            (entity, total_rows_processed)
-        )
-        new_ids = [row[0] for row in new_ids_result]
+        if total_rows_processed == 0:
+            db_manager.connection.rollback()
+            return 0, f"No new records found for entity {entity} after duplicate validation"
         
-        print(f"IDs obtenidos: {len(new_ids)}")
+        print(f"Registros insertados exitosamente: {total_rows_processed}")
         
-        # 9. INSERTAR COMPONENTES DE REGULACIÓN
-        inserted_count_comp = 0
-        component_message = ""
+        # 4. INSERTAR COMPONENTES DE REGULACIÓN
+        inserted_count_comp, component_message = insert_regulations_component(db_manager, new_ids, commit=False)
+        print(f"Componentes: {component_message}")
         
-        if new_ids:
-            try:
-                inserted_count_comp, component_message = insert_regulations_component(db_manager, new_ids)
-                print(f"Componentes: {component_message}")
-            except Exception as comp_error:
-                print(f"Error insertando componentes: {comp_error}")
-                component_message = f"Error inserting components: {str(comp_error)}"
+        # Si fallan los componentes se descarta toda la transacción
+        if inserted_count_comp != len(new_ids):
+            raise Exception(component_message)
+        
+        db_manager.connection.commit()
         
-        # 10. MENSAJE FINAL CON ESTADÍSTICAS DETALLADAS
+        # 5. MENSAJE FINAL CON ESTADÍSTICAS DETALLADAS
         total_duplicates = duplicates_found + internal_duplicates
         stats = (
             f"Processed: {len(entity_df)} | "
-            f"Existing: {len(db_df)} | "
             f"Duplicates skipped: {total_duplicates} | "
             f"New inserted: {total_rows_processed}"
         )
@@ -544,7 +648,13 @@ def check_for_new_content(num_pages_to_check=3):
             return True  # En caso de error, proceder con el scraping
         
         # Obtener la fecha de creación más reciente en la base de datos
-        query = "SELECT MAX(created_at) FROM dapper_regulations_regulations WHERE entity = %s"
+        # Resuelto con el índice (entity, created_at DESC); NULLs excluidos como en MAX()
+        query = """
+            SELECT created_at FROM dapper_regulations_regulations
+            WHERE entity = %s AND created_at IS NOT NULL
+            ORDER BY created_at DESC
+            LIMIT 1
+        """
         result = db_manager.execute_query(query, (ENTITY_VALUE,))
         
         latest_db_date = None
@@ -553,13 +663,7 @@ def check_for_new_content(num_pages_to_check=3):
             
             # Normalizar fecha de la base de datos
             if isinstance(latest_db_date, str):
-                try:
-                    latest_db_date = datetime.strptime(latest_db_date, '%Y-%m-%d %H:%M:%S')
-                except:
-                    try:
-                        latest_db_date = datetime.strptime(latest_db_date.split()[0], '%Y-%m-%d')
-                    except:
-                        latest_db_date = None
+                latest_db_date = parse_date_str(latest_db_date)
             
             # Normalizar datetime (quitar timezone info)
             latest_db_date = normalize_datetime(latest_db_date)
@@ -572,28 +676,26 @@ def check_for_new_content(num_pages_to_check=3):
         for page_num in range(num_pages_to_check):
             try:
                 page_data = scrape_page(page_num, verbose=False)
+                page_has_dates = False
                 
-                for record in page_data:
-                    created_at_val = record.get('created_at')
+                for created_at_val in page_data['created_at']:
                     
                     if created_at_val and is_valid_created_at(created_at_val):
-                        web_date = None
-                        try:
-                            web_date = datetime.strptime(created_at_val, '%Y-%m-%d %H:%M:%S')
-                        except:
-                            try:
-                                web_date = datetime.strptime(created_at_val.split()[0], '%Y-%m-%d')
-                            except:
-                                continue
-                        
-                        # Normalizar fecha web (quitar timezone info)
-                        web_date = normalize_datetime(web_date)
+                        web_date = parse_date_str(created_at_val)
+                        if web_date is None:
+                            continue
+                        page_has_dates = True
                         
                         # Si encontramos contenido más reciente que el de la base de datos
                         if not latest_db_date or web_date > latest_db_date:
                             print(f"Nuevo contenido detectado - Fecha web: {web_date}, Fecha BD: {latest_db_date}")
                             return True
                 
+                # Las páginas van de más reciente a más antigua: si toda esta página
+                # es anterior a la BD, las siguientes también lo son
+                if page_has_dates:
+                    break
+                
             except Exception as e:
                 print(f"Error verificando página {page_num}: {e}")
                 continue
@@ -638,19 +740,19 @@ def lambda_handler(event, context):
         
         print(f"Procesando páginas más recientes desde {start_page} hasta {end_page}")
         
-        # Proceso principal de scraping
-        all_normas_data = []
+        # Proceso principal de scraping: las páginas se descargan en paralelo con asyncio
+        results = asyncio.run(scrape_pages(range(start_page, end_page + 1)))
         
-        for page_num in range(start_page, end_page + 1):
-            print(f"Procesando página {page_num}...")
-            page_data = scrape_page(page_num)
-            all_normas_data.extend(page_data)
-            
-            # Indicador de progreso cada 3 páginas
-            if (page_num + 1) % 3 == 0:
-                print(f"Procesadas {page_num + 1}/{num_pages_to_scrape} páginas. Encontrados {len(all_normas_data)} registros válidos.")
+        # Unir las páginas columna por columna
+        all_normas_data = empty_columns()
+        for page_data in results:
+            for col in NORMA_COLUMNS:
+                all_normas_data[col].extend(page_data[col])
+        
+        total_records = len(all_normas_data['title'])
+        print(f"Procesadas {num_pages_to_scrape} páginas. Encontrados {total_records} registros válidos.")
         
-        if not all_normas_data:
+        if not total_records:
             return {
                 'statusCode': 200,
                 'body': json.dumps({
@@ -662,8 +764,8 @@ def lambda_handler(event, context):
                 })
             }
         
-        # Crear DataFrame
-        df_normas = pd.DataFrame(all_normas_data)
+        # Crear DataFrame directamente desde las columnas
+        df_normas = pd.DataFrame(all_normas_data, columns=NORMA_COLUMNS, copy=False)
         print(f"Total de registros extraídos: {len(df_normas)}")
         
         # Operaciones de base de datos
@@ -0,0 +1,46 @@
+-- Migraciones para la tabla regulations usada por lambda.py
+-- CONCURRENTLY no puede ejecutarse dentro de una transacción: correr cada sentencia por separado.
+
+-- Eliminar duplicados previos antes de crear el índice único.
+-- La deduplicación anterior comparaba created_at como texto y nunca coincidía, así que
+-- la tabla tiene registros repetidos por (entity, title, created_at, external_link).
+-- Se conserva el menor id por clave y los componentes de los duplicados se repuntan a él
+-- (y se eliminan los que quedan repetidos). Las filas con entidad, título o fecha nulos
+-- no se tocan: el índice único no las considera iguales.
+BEGIN;
+
+CREATE TEMP TABLE _regulations_dups ON COMMIT DROP AS
+SELECT id, keep_id
+FROM (
+  SELECT id,
+         min(id) OVER (PARTITION BY entity, title, created_at, COALESCE(external_link, '')) AS keep_id
+  FROM regulations
+  WHERE entity IS NOT NULL AND title IS NOT NULL AND created_at IS NOT NULL
+) ranked
+WHERE id <> keep_id;
+
+UPDATE regulations_component c
+SET regulations_id = d.keep_id
+FROM _regulations_dups d
+WHERE c.regulations_id = d.id;
+
+DELETE FROM regulations_component c
+USING regulations_component k
+WHERE c.regulations_id = k.regulations_id
+  AND c.components_id IS NOT DISTINCT FROM k.components_id
+  AND c.id > k.id
+  AND c.regulations_id IN (SELECT keep_id FROM _regulations_dups);
+
+DELETE FROM regulations r
+USING _regulations_dups d
+WHERE r.id = d.id;
+
+COMMIT;
+
+-- Índice único para deduplicar en el servidor (INSERT ... ON CONFLICT DO NOTHING).
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS regulations_dedup_idx
+  ON regulations (entity, title, created_at, COALESCE(external_link, ''));
+
+-- Índice para obtener la fecha más reciente por entidad (check_for_new_content)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS regulations_entity_created_idx
+  ON dapper_regulations_regulations (entity, created_at DESC);
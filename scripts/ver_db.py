@@ -1,20 +1,24 @@
 #!/usr/bin/env python3
 """
-Script para visualizar todas las regulaciones en la base de datos
-Uso: python ver_db.py
+Script para visualizar las regulaciones en la base de datos, por páginas
+Uso: python ver_db.py [--page N]
 """
 
 import sys
 import os
+import argparse
 
 # Añadir el directorio src al path
 sys.path.insert(0, '/opt/airflow/src')
 from db import DatabaseManager
 from tabulate import tabulate
 
+# Regulaciones por página
+PAGE_SIZE = 500
 
-def mostrar_todas_regulaciones():
-    """Muestra todas las regulaciones en la base de datos"""
+
+def mostrar_todas_regulaciones(page=0):
+    """Muestra una página de regulaciones de la base de datos (la 0 es la más reciente)"""
     
     db_manager = DatabaseManager()
     
@@ -23,18 +27,16 @@ def mostrar_todas_regulaciones():
         return
     
     try:
-        # Query para obtener todas las regulaciones
+        # Query para obtener una página de regulaciones
         query = """
             SELECT id, title, entity, created_at, is_active, rtype_id, external_link
             FROM regulations 
             ORDER BY id DESC
+            LIMIT %s OFFSET %s
         """
         
-        result = db_manager.execute_query(query)
-        
-        if not result:
-            print("\n⚠️  No hay regulaciones en la base de datos\n")
-            return
+        # Las filas llegan por lotes desde un cursor del servidor
+        result = db_manager.execute_query_stream(query, (PAGE_SIZE, page * PAGE_SIZE))
         
         # Preparar datos para mostrar
         headers = ['ID', 'Título', 'Entidad', 'Fecha Creación', 'Activo', 'Tipo', 'Link']
@@ -57,9 +59,13 @@ def mostrar_todas_regulaciones():
             
             rows.append([reg_id, title_short, entity, fecha_str, activo_str, rtype_id, link_short])
         
+        if not rows:
+            print(f"\n⚠️  No hay regulaciones en la página {page} de la base de datos\n")
+            return
+        
         # Mostrar resultados
         print("\n" + "=" * 150)
-        print(f"📋 TODAS LAS REGULACIONES EN LA BASE DE DATOS (Total: {len(rows)})")
+        print(f"📋 REGULACIONES EN LA BASE DE DATOS (Página {page}, Total: {len(rows)})")
         print("=" * 150 + "\n")
         print(tabulate(rows, headers=headers, tablefmt='grid'))
         print("\n" + "=" * 150)
@@ -76,4 +82,8 @@ def mostrar_todas_regulaciones():
 
 
 if __name__ == "__main__":
-    mostrar_todas_regulaciones()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Visualiza las regulaciones en la base de datos")
+    parser.add_argument('--page', type=int, default=0,
+                        help=f"Página a mostrar ({PAGE_SIZE} regulaciones por página, 0 = más recientes)")
+    args = parser.parse_args()
+    mostrar_todas_regulaciones(args.page)
\ No newline at end of file
@@ -1,14 +1,31 @@
 import psycopg2
+from psycopg2.extras import execute_values
 import pandas as pd
 import os
+import io
+import csv
 from urllib.parse import urlparse
 from typing import Dict
 
+# Por debajo de este número de filas COPY no compensa y se usa execute_values
+COPY_THRESHOLD = 500
+
+# Keepalives TCP para que NAT/balanceadores no corten conexiones inactivas
+CONNECT_OPTIONS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+    'application_name': 'dapper',
+}
+
 
 class DatabaseManager:
     def __init__(self):
         self.connection = None
         self.cursor = None
+        self.batching = False
+        self.batch_failed = False
 
     def connect(self):
         try:
@@ -20,6 +37,7 @@ class DatabaseManager:
                 password=params['password'],
                 host=params['host'],
                 port=params['port'],
+                **CONNECT_OPTIONS,
             )
             self.cursor = self.connection.cursor()
             return True
@@ -60,29 +78,192 @@ class DatabaseManager:
         if self.connection:
             self.connection.close()
 
+    def begin(self):
+        """
+        Inicia un lote: los commits se difieren hasta commit_all() para que varias
+        entidades se confirmen en una sola transacción (un solo fsync del WAL).
+        """
+        self.batching = True
+        self.batch_failed = False
+
+    def commit(self):
+        """Confirma la transacción actual, salvo que haya un lote abierto."""
+        if not self.batching:
+            self.connection.commit()
+
+    def commit_all(self):
+        """
+        Confirma el lote abierto con begin() y lo cierra. Si el lote se descartó
+        por un error, no confirma nada y lanza una excepción.
+        """
+        failed = self.batch_failed
+        self.batching = False
+        self.batch_failed = False
+        if failed:
+            self.connection.rollback()
+            raise Exception("Batch discarded after an error; nothing was committed")
+        self.connection.commit()
+
+    def rollback(self):
+        """
+        Descarta la transacción actual. En un lote se descarta el lote completo: el
+        lote sigue abierto pero marcado como fallido, para que el llamador lo cierre.
+        """
+        if self.batching:
+            self.batch_failed = True
+        self.connection.rollback()
+
+    def _check_batch(self):
+        """Evita seguir escribiendo en un lote ya descartado (su trabajo previo se perdió)."""
+        if self.batch_failed:
+            raise Exception("Batch discarded after an error; call commit_all() to close it")
+
     def execute_query(self, query, params=None):
         if not self.cursor:
             raise Exception("Database not connected")
         self.cursor.execute(query, params)
         return self.cursor.fetchall()
 
-    def bulk_insert(self, df, table_name):
+    def execute_query_stream(self, query, params=None, itersize=1000):
+        """
+        Ejecuta un SELECT con un cursor del lado del servidor y retorna las filas
+        a medida que llegan, de a `itersize` por viaje (sin fetchall en memoria).
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        with self.connection.cursor(name='query_stream') as cursor:
+            cursor.itersize = itersize
+            cursor.execute(query, params)
+            yield from cursor
+
+    def bulk_insert(self, df, table_name, use_copy=True, returning=None, on_conflict=None, commit=True):
+        """
+        Inserta el DataFrame en la tabla. Usa COPY para lotes grandes y execute_values
+        para lotes pequeños o cuando use_copy=False (p. ej. tablas con triggers/reglas).
+        
+        `on_conflict` se agrega tal cual al INSERT (p. ej. "ON CONFLICT DO NOTHING").
+        Si se indica `returning` (p. ej. 'id'), retorna (cantidad, valores_retornados);
+        en caso contrario retorna la cantidad de filas insertadas.
+        Con commit=False la transacción queda abierta para que el llamador la confirme.
+        """
         if not self.connection or not self.cursor:
             raise Exception("Database not connected")
+        self._check_batch()
         
         try:
-            df = df.astype(object).where(pd.notnull(df), None)
+            # Solo las columnas con nulos pasan a object (NaN/NaT -> None); el resto se
+            # recorre tal cual, sin copiar el DataFrame ni materializar df.values
+            column_values = [
+                self._nullable_column(df[col]) if has_nulls else df[col]
+                for col, has_nulls in zip(df.columns, df.isna().any().to_numpy())
+            ]
             columns_for_sql = ", ".join([f'"{col}"' for col in df.columns])
-            placeholders = ", ".join(["%s"] * len(df.columns))
+            # Iterador de tuplas por fila: execute_values y COPY lo consumen por páginas,
+            # sin materializar una lista con todas las filas
+            records_to_insert = zip(*column_values)
+            total_rows = len(df)
+            conflict_sql = f" {on_conflict}" if on_conflict else ""
+            returning_sql = f" RETURNING {returning}" if returning else ""
+            returned = None
             
-            insert_query = f"INSERT INTO {table_name} ({columns_for_sql}) VALUES ({placeholders})"
-            records_to_insert = [tuple(x) for x in df.values]
+            if not use_copy or total_rows < COPY_THRESHOLD:
+                # Un solo INSERT multi-VALUES por página de 1000 filas. Con ON CONFLICT se
+                # cuentan las filas devueltas (rowcount solo refleja la última página),
+                # igual que el camino de la tabla temporal
+                count_sql = returning_sql or (" RETURNING 1" if on_conflict else "")
+                insert_query = f"INSERT INTO {table_name} ({columns_for_sql}) VALUES %s{conflict_sql}{count_sql}"
+                template = "(" + ",".join(["%s"] * len(df.columns)) + ")"
+                result = execute_values(
+                    self.cursor, insert_query, records_to_insert,
+                    template=template, page_size=1000, fetch=bool(count_sql)
+                )
+                inserted = total_rows
+                if count_sql:
+                    inserted = len(result)
+                if returning:
+                    returned = [row[0] for row in result]
+            elif returning or on_conflict:
+                # COPY no admite RETURNING ni ON CONFLICT: se carga a una tabla temporal (solo con las
+                # columnas a insertar, sin consumir la secuencia) y se inserta desde ahí
+                staging_table = f"_staging_{table_name}"
+                self.cursor.execute(
+                    f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS "
+                    f"SELECT {columns_for_sql} FROM {table_name} WITH NO DATA"
+                )
+                self._copy_records(staging_table, columns_for_sql, records_to_insert)
+                self.cursor.execute(
+                    f"INSERT INTO {table_name} ({columns_for_sql}) "
+                    f"SELECT {columns_for_sql} FROM {staging_table}{conflict_sql}{returning_sql}"
+                )
+                if returning:
+                    returned = [row[0] for row in self.cursor.fetchall()]
+                    inserted = len(returned)
+                else:
+                    inserted = self.cursor.rowcount
+                # Se elimina ya (no al COMMIT) por si se reutiliza en la misma transacción
+                self.cursor.execute(f"DROP TABLE {staging_table}")
+            else:
+                inserted = self._copy_records(table_name, columns_for_sql, records_to_insert)
             
-            self.cursor.executemany(insert_query, records_to_insert)
-            self.connection.commit()
-            return len(df)
+            if commit:
+                self.commit()
+            if returning:
+                return inserted, returned
+            return inserted
         except Exception as e:
-            self.connection.rollback()
+            self.rollback()
             raise Exception(f"Error inserting into {table_name}: {str(e)}")
-        
 
+    def bulk_insert_records(self, records, table_name, columns, commit=True):
+        """
+        Inserta una lista de dicts con execute_values, sin pasar por un DataFrame
+        (para lotes pequeños ya construidos en Python). Retorna la cantidad de filas.
+        """
+        if not self.connection or not self.cursor:
+            raise Exception("Database not connected")
+        self._check_batch()
+
+        try:
+            columns_for_sql = ", ".join([f'"{col}"' for col in columns])
+            insert_query = f"INSERT INTO {table_name} ({columns_for_sql}) VALUES %s"
+            execute_values(
+                self.cursor, insert_query,
+                [tuple(record[col] for col in columns) for record in records],
+                page_size=1000
+            )
+            if commit:
+                self.commit()
+            return len(records)
+        except Exception as e:
+            self.rollback()
+            raise Exception(f"Error inserting into {table_name}: {str(e)}")
+
+    def _nullable_column(self, series):
+        """
+        Convierte una columna con nulos a object con None en lugar de NaN/NaT.
+        Una columna entera con nulos llega como float64 (15 -> 15.0), lo que COPY
+        rechaza en columnas INTEGER: si todos sus valores son enteros se pasa a Int64.
+        """
+        if pd.api.types.is_float_dtype(series):
+            values = series.dropna()
+            if not values.empty and (values % 1 == 0).all():
+                series = series.astype('Int64')
+        return series.astype(object).where(series.notna(), None)
+
+    def _copy_records(self, table_name, columns_for_sql, records):
+        """Carga los registros con COPY FROM STDIN y retorna la cantidad de filas copiadas."""
+        # Buffer CSV (tabulado) en memoria; los nulos van como \N
+        buf = io.StringIO()
+        writer = csv.writer(buf, delimiter='\t', quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+        writer.writerows(
+            tuple('\\N' if value is None else value for value in record)
+            for record in records
+        )
+        buf.seek(0)
+        
+        copy_query = (
+            f"COPY {table_name} ({columns_for_sql}) "
+            f"FROM STDIN WITH (FORMAT CSV, DELIMITER E'\\t', NULL '\\N')"
+        )
+        self.cursor.copy_expert(copy_query, buf)
+        return self.cursor.rowcount
@@ -1,9 +1,30 @@
+import logging
 import pandas as pd
+from collections import OrderedDict
 from db import DatabaseManager
 from typing import Tuple 
 
+# Argumentos con formato diferido (%s): no se construyen si el nivel está deshabilitado
+log = logging.getLogger(__name__)
 
-def insert_regulations_component(db_manager, new_ids):
+# Claves (title, created_at, external_link) ya confirmadas en la BD durante este
+# proceso, por entidad; FIFO acotado para no crecer sin límite
+SEEN_KEYS_MAX = 100_000
+_seen_keys = {}
+
+
+def remember_keys(entity, keys):
+    """
+    Registra claves ya presentes en la BD para omitirlas en próximas inserciones.
+    """
+    seen = _seen_keys.setdefault(entity, OrderedDict())
+    for key in keys:
+        seen[key] = None
+    while len(seen) > SEEN_KEYS_MAX:
+        seen.popitem(last=False)
+
+
+def insert_regulations_component(db_manager, new_ids, commit=True):
     """
     Inserta los componentes de las regulaciones.
     """
@@ -11,194 +32,122 @@ def insert_regulations_component(db_manager, new_ids):
         return 0, "No new regulation IDs provided"
 
     try:
-        id_rows = pd.DataFrame(new_ids, columns=['regulations_id'])
-        id_rows['components_id'] = 7
-        
-        inserted_count = db_manager.bulk_insert(id_rows, 'regulations_component')
+        # Lista de dicts directa: no hace falta un DataFrame para dos columnas
+        id_rows = [{'regulations_id': regulation_id, 'components_id': 7} for regulation_id in new_ids]
+
+        inserted_count = db_manager.bulk_insert_records(
+            id_rows, 'regulations_component', ['regulations_id', 'components_id'], commit=commit
+        )
         return inserted_count, f"Successfully inserted {inserted_count} regulation components"
         
     except Exception as e:
         return 0, f"Error inserting regulation components: {str(e)}"
 
-def insert_new_records(db_manager, df, entity):
+def group_by_entity(df):
+    """
+    Agrupa el DataFrame por entidad en una sola pasada ({entidad: DataFrame}).
+    """
+    return dict(list(df.groupby('entity', sort=False)))
+
+def insert_new_records(db_manager, df, entity, df_by_entity=None):
     """
     Inserta nuevos registros en la base de datos evitando duplicados.
-    Optimizada para velocidad y precisión.
+    Si se procesan varias entidades, pasar df_by_entity (ver group_by_entity)
+    evita recorrer el DataFrame completo por cada una.
+    La deduplicación la resuelve Postgres con el índice único regulations_dedup_idx.
+    Regulaciones y componentes se confirman en una sola transacción.
     """
     regulations_table_name = 'regulations'
     
     try:
-        # 1. OBTENER REGISTROS EXISTENTES INCLUYENDO EXTERNAL_LINK
-        query = """
-            SELECT title, created_at, entity, COALESCE(external_link, '') as external_link 
-            FROM {} 
-            WHERE entity = %s
-        """.format(regulations_table_name)
-        
-        existing_records = db_manager.execute_query(query, (entity,))
-        
-        if not existing_records:
-            db_df = pd.DataFrame(columns=['title', 'created_at', 'entity', 'external_link'])
+        # 1. PREPARAR DATAFRAME DE LA ENTIDAD
+        if df_by_entity is not None:
+            entity_df = df_by_entity.get(entity, df.iloc[0:0]).copy()
         else:
-            db_df = pd.DataFrame(existing_records, columns=['title', 'created_at', 'entity', 'external_link'])
-        
-        print(f"Registros existentes en BD para {entity}: {len(db_df)}")
-        
-        # 2. PREPARAR DATAFRAME DE LA ENTIDAD
-        entity_df = df[df['entity'] == entity].copy()
+            entity_df = df[df['entity'] == entity].copy()
         
         if entity_df.empty:
             return 0, f"No records found for entity {entity}"
         
-        print(f"Registros a procesar para {entity}: {len(entity_df)}")
-        
-        # 3. NORMALIZAR DATOS PARA COMPARACIÓN CONSISTENTE
-        # Normalizar created_at a string
-        if not db_df.empty:
-            db_df['created_at'] = db_df['created_at'].astype(str)
-            db_df['external_link'] = db_df['external_link'].fillna('').astype(str)
-            db_df['title'] = db_df['title'].astype(str).str.strip()
+        total_processed = len(entity_df)
+        log.info("Registros a procesar para %s: %s", entity, total_processed)
         
-        entity_df['created_at'] = entity_df['created_at'].astype(str)
+        # 2. NORMALIZAR DATOS PARA QUE COINCIDAN CON LA CLAVE DEL ÍNDICE ÚNICO
+        entity_df['created_at'] = pd.to_datetime(entity_df['created_at'], errors='coerce').dt.floor('D')
         entity_df['external_link'] = entity_df['external_link'].fillna('').astype(str)
         entity_df['title'] = entity_df['title'].astype(str).str.strip()
         
-        # 4. IDENTIFICAR DUPLICADOS DE MANERA OPTIMIZADA
-        print("=== INICIANDO VALIDACIÓN DE DUPLICADOS OPTIMIZADA ===")
-        
-        if db_df.empty:
-            # Si no hay registros existentes, todos son nuevos
-            new_records = entity_df.copy()
-            duplicates_found = 0
-            print("No hay registros existentes, todos son nuevos")
-        else:
-            # Crear claves únicas para comparación super rápida
-            entity_df['unique_key'] = (
-                entity_df['title'] + '|' + 
-                entity_df['created_at'] + '|' + 
-                entity_df['external_link']
-            )
-            
-            db_df['unique_key'] = (
-                db_df['title'] + '|' + 
-                db_df['created_at'] + '|' + 
-                db_df['external_link']
-            )
-            
-            # Usar set para comparación O(1) - súper rápido
-            existing_keys = set(db_df['unique_key'])
-            entity_df['is_duplicate'] = entity_df['unique_key'].isin(existing_keys)
-            
-            new_records = entity_df[~entity_df['is_duplicate']].copy()
-            duplicates_found = len(entity_df) - len(new_records)
-            
-            # Log para debugging
-            if duplicates_found > 0:
-                print(f"Duplicados encontrados: {duplicates_found}")
-                duplicate_records = entity_df[entity_df['is_duplicate']]
-                print("Ejemplos de duplicados:")
-                for idx, row in duplicate_records.head(3).iterrows():
-                    print(f"  - {row['title'][:50]}... | {row['created_at']}")
-        
-        # 5. REMOVER DUPLICADOS INTERNOS DEL DATAFRAME
-        print(f"Antes de remover duplicados internos: {len(new_records)}")
-        new_records = new_records.drop_duplicates(
-            subset=['title', 'created_at', 'external_link'], 
-            keep='first'
-        )
-        internal_duplicates = len(entity_df) - duplicates_found - len(new_records)
+        # Duplicados internos (evita enviarlos a la BD); duplicated factoriza las
+        # columnas clave en C, exacto y sin riesgo de colisiones de hash
+        key_cols = ['title', 'created_at', 'external_link']
+        internal_mask = entity_df.duplicated(subset=key_cols, keep='first').to_numpy()
+        internal_duplicates = int(internal_mask.sum())
         if internal_duplicates > 0:
-            print(f"Duplicados internos removidos: {internal_duplicates}")
+            log.debug("Duplicados internos removidos: %s", internal_duplicates)
+            entity_df = entity_df[~internal_mask]
+        
+        # Claves ya vistas en este proceso: ni siquiera se envían a la BD
+        seen = _seen_keys.get(entity)
+        if seen:
+            keys = entity_df[key_cols].itertuples(index=False, name=None)
+            unseen_mask = [key not in seen for key in keys]
+            if not all(unseen_mask):
+                log.debug("Registros ya conocidos omitidos: %s", unseen_mask.count(False))
+                entity_df = entity_df[unseen_mask]
+                if entity_df.empty:
+                    return 0, f"No new records found for entity {entity} after duplicate validation"
+        
+        # 3. INSERTAR SOLO LOS NUEVOS (duplicados contra la BD e internos se omiten en SQL)
+        log.debug("Insertando %s registros (ON CONFLICT DO NOTHING)", len(entity_df))
+        total_rows_processed, new_ids = db_manager.bulk_insert(
+            entity_df, regulations_table_name,
+            returning='id',
+            on_conflict="ON CONFLICT (title, created_at, entity, COALESCE(external_link, '')) DO NOTHING",
+            commit=False
+        )
         
-        print(f"Después de remover duplicados internos: {len(new_records)}")
-        print(f"=== DUPLICADOS IDENTIFICADOS: {duplicates_found + internal_duplicates} ===")
+        total_duplicates = total_processed - total_rows_processed
+        log.debug("Duplicados omitidos: %s", total_duplicates)
         
-        if new_records.empty:
+        if total_rows_processed == 0:
+            db_manager.commit()
+            if not db_manager.batching:
+                remember_keys(entity, entity_df[key_cols].itertuples(index=False, name=None))
             return 0, f"No new records found for entity {entity} after duplicate validation"
         
-        # 6. LIMPIAR DATAFRAME ANTES DE INSERTAR
-        # Remover columnas auxiliares
-        columns_to_drop = ['unique_key', 'is_duplicate']
-        for col in columns_to_drop:
-            if col in new_records.columns:
-                new_records = new_records.drop(columns=[col])
-        
-        print(f"Registros finales a insertar: {len(new_records)}")
-        
-        # 7. INSERTAR NUEVOS REGISTROS
-        try:
-            print(f"=== INSERTANDO {len(new_records)} REGISTROS ===")
-            
-            total_rows_processed = db_manager.bulk_insert(new_records, regulations_table_name)
-            
-            if total_rows_processed == 0:
-                return 0, f"No records were actually inserted for entity {entity}"
-            
-            print(f"Registros insertados exitosamente: {total_rows_processed}")
-            
-        except Exception as insert_error:
-            print(f"Error en inserción: {insert_error}")
-            # Si es error de duplicados, algunos se escaparon
-            if "duplicate" in str(insert_error).lower() or "unique" in str(insert_error).lower():
-                print("Error de duplicados detectado - algunos registros ya existían")
-                return 0, f"Some records for entity {entity} were duplicates and skipped"
-            else:
-                raise insert_error
-        
-        # 8. OBTENER IDS DE REGISTROS INSERTADOS - MÉTODO OPTIMIZADO
-        print("=== OBTENIENDO IDS DE REGISTROS INSERTADOS ===")
-        
-        # Método simple y eficiente - obtener los últimos N IDs
-        new_ids_query = f"""
-            SELECT id FROM {regulations_table_name}
-            WHERE entity = %s 
-            ORDER BY id DESC
-            LIMIT %s
-        """
-        
-        new_ids_result = db_manager.execute_query(
-            new_ids_query, 
-            (entity, total_rows_processed)
-        )
-        new_ids = [row[0] for row in new_ids_result]
+        log.debug("Registros insertados exitosamente: %s (IDs obtenidos: %s)", total_rows_processed, len(new_ids))
+        
+        # 4. INSERTAR COMPONENTES DE REGULACIÓN (misma transacción, un solo COMMIT)
+        inserted_count_comp, component_message = insert_regulations_component(db_manager, new_ids, commit=False)
+        log.debug("Componentes: %s", component_message)
         
-        print(f"IDs obtenidos: {len(new_ids)}")
+        # Si fallan los componentes se descarta toda la transacción
+        if inserted_count_comp != len(new_ids):
+            raise Exception(component_message)
         
-        # 9. INSERTAR COMPONENTES DE REGULACIÓN
-        inserted_count_comp = 0
-        component_message = ""
+        db_manager.commit()
         
-        if new_ids:
-            try:
-                inserted_count_comp, component_message = insert_regulations_component(db_manager, new_ids)
-                print(f"Componentes: {component_message}")
-            except Exception as comp_error:
-                print(f"Error insertando componentes: {comp_error}")
-                component_message = f"Error inserting components: {str(comp_error)}"
+        # Tras confirmar, todas las claves del lote existen en la BD (nuevas o duplicadas)
+        if not db_manager.batching:
+            remember_keys(entity, entity_df[key_cols].itertuples(index=False, name=None))
         
-        # 10. MENSAJE FINAL CON ESTADÍSTICAS DETALLADAS
-        total_duplicates = duplicates_found + internal_duplicates
+        # 5. MENSAJE FINAL CON ESTADÍSTICAS DETALLADAS
         stats = (
-            f"Processed: {len(entity_df)} | "
-            f"Existing: {len(db_df)} | "
+            f"Processed: {total_processed} | "
             f"Duplicates skipped: {total_duplicates} | "
             f"New inserted: {total_rows_processed}"
         )
         
         message = f"Entity {entity}: {stats}. {component_message}"
-        print(f"=== RESULTADO FINAL ===")
-        print(message)
-        print("=" * 50)
+        log.info("Resultado final: %s", message)
         
         return total_rows_processed, message
         
     except Exception as e:
         if hasattr(db_manager, 'connection') and db_manager.connection:
-            db_manager.connection.rollback()
+            db_manager.rollback()
         error_msg = f"Error processing entity {entity}: {str(e)}"
-        print(f"ERROR CRÍTICO: {error_msg}")
-        import traceback
-        print(traceback.format_exc())
+        log.exception("Error crítico: %s", error_msg)
         return 0, error_msg
 
 def run_write(df: pd.DataFrame, entity: str) -> Tuple[int,str]:
@@ -1,7 +1,14 @@
 import re
 from datetime import datetime
-from bs4 import BeautifulSoup
+from lxml import etree
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
+import asyncio
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from db import DatabaseManager 
 import pandas as pd
 
@@ -11,6 +18,24 @@ ENTITY_VALUE = 'Agencia Nacional de Infraestructura'
 FIXED_CLASSIFICATION_ID = 13
 URL_BASE = "https://www.ani.gov.co/informacion-de-la-ani/normatividad?field_tipos_de_normas__tid=12&title=&body_value=&field_fecha__value%5Bvalue%5D%5Byear%5D="
 
+# Conexiones HTTP simultáneas (tamaño del pool y de hilos de scraping)
+HTTP_POOL_SIZE = 16
+
+# Hilos para parsear páginas: lxml libera el GIL, escala con los núcleos
+PARSE_WORKERS = os.cpu_count() or 1
+
+# Cabeceras comunes: respuestas comprimidas y conexión persistente
+HTTP_HEADERS = {'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'}
+
+# Sesión compartida: reutiliza conexiones TCP/TLS (keep-alive) y reintenta errores transitorios
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=HTTP_POOL_SIZE,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+))
+_SESSION.headers.update(HTTP_HEADERS)
+
 # Clasificaciones de documentos
 CLASSIFICATION_KEYWORDS = {
     'resolución': 15,
@@ -20,45 +45,93 @@ CLASSIFICATION_KEYWORDS = {
 
 DEFAULT_RTYPE_ID = 14
 
+# Estructura base de cada registro de norma; se copia por fila
+NORMA_TEMPLATE = {
+    'created_at': None,
+    'update_at': None,
+    'is_active': True,
+    'title': None,
+    'gtype': None,
+    'entity': ENTITY_VALUE,
+    'external_link': None,
+    'rtype_id': None,
+    'summary': None,
+    'classification_id': FIXED_CLASSIFICATION_ID,
+}
+
+# Una sola alternancia compilada: el título se recorre una vez para todas las palabras clave
+CLASSIFICATION_RE = re.compile('|'.join(map(re.escape, CLASSIFICATION_KEYWORDS)), re.IGNORECASE)
+# Prioridad de cada palabra clave (orden de CLASSIFICATION_KEYWORDS)
+CLASSIFICATION_PRIORITY = {keyword: rank for rank, keyword in enumerate(CLASSIFICATION_KEYWORDS)}
+
+# Tabla de traducción para eliminar comillas
+QUOTE_CHARS = '\u201C\u201D\u2018\u2019\u00AB\u00BB\u201E\u201A\u2039\u203A"\'´`\u2032\u2033'
+QUOTE_TRANS = str.maketrans('', '', QUOTE_CHARS)
+
+# Longitud máxima del título (ya limpio)
+MAX_TITLE_LENGTH = 65
+
+# Espacios admitidos en cadenas XPath (los de control \x0b, \x0c y \x1c-\x1f no lo son)
+XPATH_SPACE_CHARS = '\t\n\r' + ''.join(c for c in map(chr, range(0x20, 0x3001)) if c.isspace())
+# Espacios y comillas no cuentan en el largo del título limpio
+TITLE_XPATH_VARS = {
+    'drop_chars': XPATH_SPACE_CHARS + QUOTE_CHARS,
+    'max_length': MAX_TITLE_LENGTH,
+}
+
+# XPaths precompilados para recorrer la tabla de normas
+TITLE_CELL_XPATH = etree.XPath('./td[contains(@class, "views-field-title")]')
+FIRST_TITLE_LINK_XPATH = etree.XPath('(./td[contains(@class, "views-field-title")]//a)[1]')
+# Primer enlace del título solo si tiene href y si sus caracteres visibles (cota inferior
+# del largo del título limpio) no superan el máximo: los descartes seguros se filtran
+# en C sin crear strings en Python; el largo exacto se valida después
+TITLE_LINK_XPATH = etree.XPath(
+    '(./td[contains(@class, "views-field-title")]//a)[1]'
+    '[@href != "" and string-length(translate(string(), $drop_chars, "")) <= $max_length]'
+)
+SUMMARY_CELL_XPATH = etree.XPath('./td[contains(@class, "views-field-body")]')
+FECHA_CELL_XPATH = etree.XPath('./td[contains(@class, "views-field-field-fecha--1")]')
+FECHA_SPAN_XPATH = etree.XPath(
+    '(./td[contains(@class, "views-field-field-fecha--1")]//span[contains(@class, "date-display-single")])[1]'
+)
+
+# Espacios distintos del espacio simple (los demás que separa str.split())
+OTHER_SPACE_CHARS = ''.join(c for c in map(chr, range(0x3001)) if c.isspace() and c != ' ')
+# Una sola clase de caracteres: comillas o espacios que no son el espacio simple
+NEEDS_CLEANING_RE = re.compile('[' + re.escape(QUOTE_CHARS + OTHER_SPACE_CHARS) + ']')
+
+def element_text(element):
+    """
+    Texto de un elemento como get_text(strip=True) de BeautifulSoup: cada nodo de
+    texto recortado y unidos sin separador
+    """
+    return ''.join(text.strip() for text in element.itertext())
+
 def clean_quotes(text):
     if not text:
         return text
-    quotes_map = {
-        '\u201C': '', '\u2018': '', '\u2019': '', '\u00AB': '', '\u00BB': '',
-        '\u201E': '', '\u201A': '', '\u2039': '', '\u203A': '', '"': '',
-        "'": '', '´': '', '`': '', '′': '', '″': '',
-    }
-    cleaned_text = text
-    for quote_char, replacement in quotes_map.items():
-        cleaned_text = cleaned_text.replace(quote_char, replacement)
-    quotes_pattern = r'["\'\u201C\u201D\u2018\u2019\u00AB\u00BB\u201E\u201A\u2039\u203A\u2032\u2033]'
-    cleaned_text = re.sub(quotes_pattern, '', cleaned_text)
-    cleaned_text = cleaned_text.strip()
-    cleaned_text = ' '.join(cleaned_text.split())
-    return cleaned_text
+    # La mayoría de textos no tiene nada que limpiar: se devuelven tal cual.
+    # Sin esos caracteres, solo faltan espacios dobles o en los extremos (búsquedas en C)
+    if (not NEEDS_CLEANING_RE.search(text) and '  ' not in text
+            and text[0] != ' ' and text[-1] != ' '):
+        return text
+    # Una sola pasada en C con translate; split/join colapsa y recorta espacios
+    return ' '.join(text.translate(QUOTE_TRANS).split())
 
 # Obtener el rtype_id basado en el título del documento
 def get_rtype_id(title):
     """
     Obtiene el rtype_id basado en el título del documento.
+    Si aparecen varias palabras clave gana la primera de CLASSIFICATION_KEYWORDS.
     """
-    title_lower = title.lower()
+    found = [
+        keyword for keyword in map(str.lower, CLASSIFICATION_RE.findall(title))
+        if keyword in CLASSIFICATION_PRIORITY
+    ]
+    if not found:
+        return DEFAULT_RTYPE_ID
     
-    for keyword, rtype_id in CLASSIFICATION_KEYWORDS.items():
-        if keyword in title_lower:
-            return rtype_id
-    
-    return DEFAULT_RTYPE_ID
-
-# Validar el campo created_at
-def is_valid_created_at(created_at_value):
-    if not created_at_value:
-        return False
-    if isinstance(created_at_value, str):
-        return bool(created_at_value.strip())
-    if isinstance(created_at_value, datetime):
-        return True
-    return False
+    return CLASSIFICATION_KEYWORDS[min(found, key=CLASSIFICATION_PRIORITY.__getitem__)]
 
 def normalize_datetime(dt):
     """
@@ -80,24 +153,19 @@ def extract_title_and_link(row, norma_data, verbose, row_num):
     Returns:
         bool: True si se extrajo correctamente, False si debe saltarse
     """
-    title_cell = row.find('td', class_='views-field views-field-title')
-    if not title_cell:
+    # El XPath ya descarta filas sin enlace, sin href o con título seguro demasiado largo
+    title_links = TITLE_LINK_XPATH(row, **TITLE_XPATH_VARS)
+    if not title_links:
         if verbose:
-            print(f"No se encontró celda de título en la fila {row_num}. Saltando.")
-        return False
-    
-    title_link = title_cell.find('a')
-    if not title_link:
-        if verbose:
-            print(f"No se encontró enlace en la fila {row_num}. Saltando.")
+            explain_skipped_title(row, row_num)
         return False
     
     # Procesar título
-    raw_title = title_link.get_text(strip=True)
-    cleaned_title = clean_quotes(raw_title)
+    title_link = title_links[0]
+    cleaned_title = clean_quotes(element_text(title_link))
     
     # Validar longitud del título
-    if len(cleaned_title) > 65:
+    if len(cleaned_title) > MAX_TITLE_LENGTH:
         if verbose:
             print(f"Saltando norma con título demasiado largo: '{cleaned_title}' (longitud: {len(cleaned_title)})")
         return False
@@ -106,145 +174,204 @@ def extract_title_and_link(row, norma_data, verbose, row_num):
     
     # Procesar enlace
     external_link = title_link.get('href')
-    if external_link and not external_link.startswith('http'):
+    if not external_link.startswith('http'):
         external_link = 'https://www.ani.gov.co' + external_link
     
     norma_data['external_link'] = external_link
-    norma_data['gtype'] = 'link' if external_link else None
-    
-    # Validar que tenga enlace
-    if not norma_data['external_link']:
-        if verbose:
-            print(f"Saltando norma '{norma_data['title']}' por no tener enlace externo válido.")
-        return False
+    norma_data['gtype'] = 'link'
     
     return True
 
+def explain_skipped_title(row, row_num):
+    """
+    Indica por qué una fila fue descartada por TITLE_LINK_XPATH (solo en modo verbose)
+    """
+    title_links = FIRST_TITLE_LINK_XPATH(row)
+    if not title_links:
+        if not TITLE_CELL_XPATH(row):
+            print(f"No se encontró celda de título en la fila {row_num}. Saltando.")
+        else:
+            print(f"No se encontró enlace en la fila {row_num}. Saltando.")
+        return
+    
+    cleaned_title = clean_quotes(element_text(title_links[0]))
+    if len(cleaned_title) > MAX_TITLE_LENGTH:
+        print(f"Saltando norma con título demasiado largo: '{cleaned_title}' (longitud: {len(cleaned_title)})")
+    else:
+        print(f"Saltando norma '{cleaned_title}' por no tener enlace externo válido.")
+
 def extract_summary(row, norma_data):
     """
     Extrae el resumen/descripción de una fila
     """
-    summary_cell = row.find('td', class_='views-field views-field-body')
-    if summary_cell:
-        raw_summary = summary_cell.get_text(strip=True)
+    summary_cells = SUMMARY_CELL_XPATH(row)
+    if summary_cells:
+        raw_summary = element_text(summary_cells[0])
         cleaned_summary = clean_quotes(raw_summary)
         formatted_summary = cleaned_summary.capitalize()
         norma_data['summary'] = formatted_summary
     else:
         norma_data['summary'] = None
 
-def extract_creation_date(row, norma_data, verbose, row_num):
+def extract_creation_date(row, norma_data):
+    """
+    Extrae la fecha de creación cruda de una fila
     """
-    Extrae la fecha de creación de una fila
+    # La validación y el formato se resuelven por página en normalize_created_at
+    fecha_spans = FECHA_SPAN_XPATH(row)
+    if fecha_spans:
+        fecha_span = fecha_spans[0]
+        norma_data['created_at'] = fecha_span.get('content', element_text(fecha_span))
+    else:
+        # Sin span de fecha se usa el texto de la celda, si existe
+        fecha_cells = FECHA_CELL_XPATH(row)
+        norma_data['created_at'] = element_text(fecha_cells[0]) if fecha_cells else None
+
+def normalize_created_at(page_data, verbose=False):
+    """
+    Normaliza en bloque las fechas crudas de una página a 'YYYY-MM-DD'.
+    Acepta ISO ('YYYY-MM-DD' o 'YYYY-MM-DDTHH:MM:SS...') y 'DD/MM/YYYY';
+    las filas sin fecha o con fechas no reconocidas se descartan.
+    """
+    if not page_data:
+        return page_data
+    
+    raw = pd.Series([record['created_at'] for record in page_data], dtype=object)
+    # Fecha presente: no nula y no vacía, evaluado sobre toda la columna
+    present = (raw.notna() & raw.str.strip().ne('')).tolist()
+    raw_dates = raw.str.split('T').str[0]
+    dates = pd.to_datetime(raw_dates, format='%Y-%m-%d', errors='coerce').fillna(
+        pd.to_datetime(raw_dates, format='%d/%m/%Y', errors='coerce')
+    )
+    
+    normalized = []
+    for record, has_date, date in zip(page_data, present, dates.dt.strftime('%Y-%m-%d').tolist()):
+        if not has_date:
+            if verbose:
+                print(f"Saltando norma '{record['title']}' por no tener fecha de creación válida (created_at: {record['created_at']}).")
+            continue
+        if not isinstance(date, str):
+            if verbose:
+                print(f"Saltando norma '{record['title']}' por fecha de creación no reconocida (created_at: {record['created_at']}).")
+            continue
+        record['created_at'] = date
+        normalized.append(record)
+    
+    return normalized
+
+def now_str():
+    """
+    Marca de actualización ('YYYY-MM-DD HH:MM:SS'); se calcula una vez por lote, no por fila
+    """
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def build_page_url(page_num):
+    """
+    Construye la URL de una página del listado de normas
+    """
+    if page_num == 0:
+        return URL_BASE
+    return f"{URL_BASE}&page={page_num}"
+
+def outer_tbody(events):
+    """
+    Primer <tbody> cerrado que no está dentro de otro <tbody>: es el primero que se
+    abrió en el documento (las tablas anidadas en una celda cierran antes)
+    """
+    return next(
+        (element for _, element in events if next(element.iterancestors('tbody'), None) is None),
+        None
+    )
+
+def parse_page(chunks, page_num, verbose=False, update_at=None):
+    """
+    Parsea el HTML de una página de ANI a medida que llegan los bloques
+    
+    Args:
+        chunks: Iterable de bloques de bytes del HTML (stream de respuesta o [contenido])
+        page_num (int): Número de página (para los logs)
+        verbose (bool): Si mostrar logs detallados
+        update_at (str): Marca de actualización compartida por el lote (por defecto, ahora)
     
     Returns:
-        bool: True si se extrajo correctamente, False si debe saltarse
+        list: Lista de diccionarios con los datos extraídos
     """
-    fecha_cell = row.find('td', class_='views-field views-field-field-fecha--1')
-    if fecha_cell:
-        fecha_span = fecha_cell.find('span', class_='date-display-single')
-        if fecha_span:
-            created_at_raw = fecha_span.get('content', fecha_span.get_text(strip=True))
-            # Procesar diferentes formatos de fecha
-            if 'T' in created_at_raw:
-                norma_data['created_at'] = created_at_raw.split('T')[0]
-            elif '/' in created_at_raw:
-                try:
-                    day, month, year = created_at_raw.split('/')
-                    norma_data['created_at'] = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-                except:
-                    norma_data['created_at'] = created_at_raw
-            else:
-                norma_data['created_at'] = created_at_raw
-        else:
-            norma_data['created_at'] = fecha_cell.get_text(strip=True)
-    else:
-        norma_data['created_at'] = None
+    # Solo interesa el primer <tbody>: al cerrarse se deja de consumir chunks
+    parser = etree.HTMLPullParser(events=('end',), tag='tbody', encoding='utf-8')
+    tbody = None
+    for chunk in chunks:
+        parser.feed(chunk)
+        tbody = outer_tbody(parser.read_events())
+        if tbody is not None:
+            break
+    
+    if tbody is None:
+        # Tablas sin cierre explícito solo se emiten al cerrar el parser
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        tbody = outer_tbody(parser.read_events())
     
-    # Validar fecha
-    if not is_valid_created_at(norma_data['created_at']):
+    if tbody is None:
         if verbose:
-            print(f"Saltando norma '{norma_data['title']}' por no tener fecha de creación válida (created_at: {norma_data['created_at']}).")
-        return False
+            print(f"No se encontró tabla en página {page_num}")
+        return []
     
-    return True
+    rows = tbody.findall('.//tr')
+    if verbose:
+        print(f"Encontradas {len(rows)} filas en página {page_num}")
+    
+    # Procesar filas (todas comparten la marca de actualización)
+    page_template = dict(NORMA_TEMPLATE, update_at=update_at or now_str())
+    page_data = []
+    for i, row in enumerate(rows, 1):
+        try:
+            # Estructura base del registro
+            norma_data = page_template.copy()
+            
+            # Extraer datos
+            if not extract_title_and_link(row, norma_data, verbose, i):
+                continue
+            
+            extract_summary(row, norma_data)
+            
+            extract_creation_date(row, norma_data)
+            
+            # Establecer rtype_id basado en título
+            norma_data['rtype_id'] = get_rtype_id(norma_data['title'])
+            
+            page_data.append(norma_data)
+            
+        except Exception as e:
+            if verbose:
+                print(f"Error procesando fila {i} en página {page_num}: {str(e)}")
+            continue
+    
+    return normalize_created_at(page_data, verbose)
 
-def scrape_page(page_num, verbose=False):
+def scrape_page(page_num, verbose=False, session=None):
     """
     Scrapea una página específica de ANI
     
     Args:
         page_num (int): Número de página a scrapear
         verbose (bool): Si mostrar logs detallados
+        session (requests.Session): Sesión HTTP a usar (por defecto la compartida)
     
     Returns:
         list: Lista de diccionarios con los datos extraídos
     """
-    # Construir URL de la página
-    if page_num == 0:
-        page_url = URL_BASE
-    else:
-        page_url = f"{URL_BASE}&page={page_num}"
+    page_url = build_page_url(page_num)
     
     if verbose:
         print(f"Scrapeando página {page_num}: {page_url}")
     
     try:
-        # Realizar solicitud HTTP
-        response = requests.get(page_url, timeout=15)
-        response.raise_for_status()
-        
-        # Parsear HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        tbody = soup.find('tbody')
-        
-        if not tbody:
-            if verbose:
-                print(f"No se encontró tabla en página {page_num}")
-            return []
-        
-        rows = tbody.find_all('tr')
-        if verbose:
-            print(f"Encontradas {len(rows)} filas en página {page_num}")
-        
-        # Procesar filas
-        page_data = []
-        for i, row in enumerate(rows, 1):
-            try:
-                # Estructura base del registro
-                norma_data = {
-                    'created_at': None,
-                    'update_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'is_active': True,
-                    'title': None,
-                    'gtype': None,
-                    'entity': ENTITY_VALUE,
-                    'external_link': None,
-                    'rtype_id': None,
-                    'summary': None,
-                    'classification_id': FIXED_CLASSIFICATION_ID,
-                }
-                
-                # Extraer datos
-                if not extract_title_and_link(row, norma_data, verbose, i):
-                    continue
-                
-                extract_summary(row, norma_data)
-                
-                if not extract_creation_date(row, norma_data, verbose, i):
-                    continue
-                
-                # Establecer rtype_id basado en título
-                norma_data['rtype_id'] = get_rtype_id(norma_data['title'])
-                
-                page_data.append(norma_data)
-                
-            except Exception as e:
-                if verbose:
-                    print(f"Error procesando fila {i} en página {page_num}: {str(e)}")
-                continue
-        
-        return page_data
+        # El HTML se parsea a medida que llega; al encontrar la tabla se deja de leer
+        with (session or _SESSION).get(page_url, stream=True, timeout=15) as response:
+            response.raise_for_status()
+            return parse_page(response.iter_content(65536), page_num, verbose)
         
     except requests.RequestException as e:
         print(f"Error HTTP en página {page_num}: {e}")
@@ -252,71 +379,127 @@ def scrape_page(page_num, verbose=False):
     except Exception as e:
         print(f"Error procesando página {page_num}: {e}")
         return []
+
+async def fetch_page(session, page_num, verbose=False, update_at=None, executor=None):
+    """
+    Descarga una página con aiohttp y la parsea en un hilo de `executor`
+    (por defecto el executor del event loop)
+    
+    Returns:
+        list: Lista de diccionarios con los datos extraídos
+    """
+    page_url = build_page_url(page_num)
+    
+    if verbose:
+        print(f"Scrapeando página {page_num}: {page_url}")
+    
+    try:
+        async with session.get(page_url) as response:
+            response.raise_for_status()
+            html = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error HTTP en página {page_num}: {e}")
+        return []
+    
+    try:
+        # lxml corre fuera del event loop para no frenar las descargas pendientes
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, parse_page, [html], page_num, verbose, update_at)
+    except Exception as e:
+        print(f"Error procesando página {page_num}: {e}")
+        return []
+
+async def scrape_pages(page_nums, verbose=False):
+    """
+    Descarga y parsea varias páginas en paralelo sobre una sola sesión HTTP;
+    el parseo se reparte en un pool de PARSE_WORKERS hilos
+    
+    Returns:
+        list: Datos de cada página, en el mismo orden de page_nums
+    """
+    connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=15)
+    with ThreadPoolExecutor(max_workers=min(PARSE_WORKERS, len(page_nums)) or 1) as executor:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=HTTP_HEADERS) as session:
+            # Una sola marca de actualización para todas las páginas del lote
+            update_at = now_str()
+            return await asyncio.gather(*[
+                fetch_page(session, p, verbose, update_at, executor) for p in page_nums
+            ])
+    
+@lru_cache(maxsize=1)
+def _latest_db_date(entity):
+    """
+    Fecha de creación más reciente de la entidad en la base de datos (sin timezone).
+    Se consulta una sola vez por ejecución de run_extraction (que limpia la caché al
+    terminar, para no reutilizar la fecha entre corridas del DAG); los errores no se cachean.
+    """
+    db_manager = DatabaseManager()
+    if not db_manager.connect():
+        raise ConnectionError("Error conectando a la base de datos para verificación")
+    
+    try:
+        # Resuelto con el índice (entity, created_at DESC); NULLs excluidos como en MAX()
+        query = """
+            SELECT created_at FROM dapper_regulations_regulations
+            WHERE entity = %s AND created_at IS NOT NULL
+            ORDER BY created_at DESC
+            LIMIT 1
+        """
+        result = db_manager.execute_query(query, (entity,))
+    finally:
+        db_manager.close()
+    
+    if not result:
+        return None
+    
+    latest_db_date = result[0][0]
+    
+    # Normalizar fecha de la base de datos
+    if isinstance(latest_db_date, str):
+        try:
+            latest_db_date = datetime.strptime(latest_db_date, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            try:
+                latest_db_date = datetime.strptime(latest_db_date.split()[0], '%Y-%m-%d')
+            except ValueError:
+                return None
     
+    # Normalizar datetime (quitar timezone info)
+    return normalize_datetime(latest_db_date)
+
 def check_for_new_content(num_pages_to_check=3):
     """
-    Verifica si hay contenido nuevo en las primeras páginas.
+    Verifica si hay contenido nuevo comparando el registro más reciente de la web
+    con la fecha más reciente de la BD. num_pages_to_check limita cuántas páginas
+    se intentan si las primeras no traen registros.
     Retorna True si se detecta nuevo contenido, False en caso contrario.
     """
-    print(f"Verificando contenido nuevo en las primeras {num_pages_to_check} páginas...")
+    print("Verificando contenido nuevo en la primera página...")
     
     try:
-        # Conectar a la base de datos para obtener la fecha más reciente
-        db_manager = DatabaseManager()
-        if not db_manager.connect():
-            print("Error conectando a la base de datos para verificación")
-            return True  # En caso de error, proceder con el scraping
-        
-        # Obtener la fecha de creación más reciente en la base de datos
-        query = "SELECT MAX(created_at) FROM dapper_regulations_regulations WHERE entity = %s"
-        result = db_manager.execute_query(query, (ENTITY_VALUE,))
-        
-        latest_db_date = None
-        if result and result[0][0]:
-            latest_db_date = result[0][0]
-            
-            # Normalizar fecha de la base de datos
-            if isinstance(latest_db_date, str):
-                try:
-                    latest_db_date = datetime.strptime(latest_db_date, '%Y-%m-%d %H:%M:%S')
-                except:
-                    try:
-                        latest_db_date = datetime.strptime(latest_db_date.split()[0], '%Y-%m-%d')
-                    except:
-                        latest_db_date = None
-            
-            # Normalizar datetime (quitar timezone info)
-            latest_db_date = normalize_datetime(latest_db_date)
-        
-        db_manager.close()
+        latest_db_date = _latest_db_date(ENTITY_VALUE)
         
         print(f"Fecha más reciente en BD: {latest_db_date}")
         
-        # Verificar las primeras páginas en busca de contenido más reciente
+        # El listado viene ordenado del más reciente al más antiguo: basta con el
+        # primer registro de la página 0. Las páginas siguientes solo se consultan
+        # si la anterior no trajo registros (error HTTP o tabla vacía)
         for page_num in range(num_pages_to_check):
             try:
                 page_data = scrape_page(page_num, verbose=False)
+                if not page_data:
+                    continue
+                
+                # scrape_page solo retorna registros con fecha normalizada a 'YYYY-MM-DD'
+                web_date = datetime.strptime(page_data[0]['created_at'][:10], '%Y-%m-%d')
                 
-                for record in page_data:
-                    created_at_val = record.get('created_at')
-                    
-                    if created_at_val and is_valid_created_at(created_at_val):
-                        web_date = None
-                        try:
-                            web_date = datetime.strptime(created_at_val, '%Y-%m-%d %H:%M:%S')
-                        except:
-                            try:
-                                web_date = datetime.strptime(created_at_val.split()[0], '%Y-%m-%d')
-                            except:
-                                continue
-                        
-                        # Normalizar fecha web (quitar timezone info)
-                        web_date = normalize_datetime(web_date)
-                        
-                        # Si encontramos contenido más reciente que el de la base de datos
-                        if not latest_db_date or web_date > latest_db_date:
-                            print(f"Nuevo contenido detectado - Fecha web: {web_date}, Fecha BD: {latest_db_date}")
-                            return True
+                # Si el registro más reciente de la web es posterior al de la base de datos
+                if not latest_db_date or web_date > latest_db_date:
+                    print(f"Nuevo contenido detectado - Fecha web: {web_date}, Fecha BD: {latest_db_date}")
+                    return True
+                break
                 
             except Exception as e:
                 print(f"Error verificando página {page_num}: {e}")
@@ -349,10 +532,12 @@ def run_extraction(num_pages: int = 9, force_scrape: bool = False) -> pd.DataFra
         print(f"Procesando páginas más recientes desde {start_page} hasta {end_page}")
 
         all_normas_data = []
+        page_nums = range(start_page, end_page + 1)
         
-        for page_num in range(start_page, end_page + 1):
-            print(f"Procesando página {page_num}...")
-            page_data = scrape_page(page_num)
+        # Las descargas se solapan con asyncio/aiohttp; gather conserva el orden de las páginas
+        pages_data = asyncio.run(scrape_pages(page_nums))
+        for page_num, page_data in zip(page_nums, pages_data):
+            print(f"Procesada página {page_num}...")
             all_normas_data.extend(page_data)
             
             # Indicador de progreso cada 3 páginas
@@ -371,4 +556,9 @@ def run_extraction(num_pages: int = 9, force_scrape: bool = False) -> pd.DataFra
     except Exception as e:
         error_message = f"Error en la extraccion : {str(e)}"
         print(error_message)
-        raise
\ No newline at end of file
+        raise
+    finally:
+        # Libera las conexiones ociosas del pool entre ejecuciones del DAG
+        _SESSION.close()
+        # La próxima ejecución debe ver las filas insertadas por esta
+        _latest_db_date.cache_clear()
\ No newline at end of file
@@ -45,10 +45,10 @@ class DataValidator:
                         f"Tipos Validos: {self.VALID_TYPES}"
                     )
                 
-                # Validar regex si está especificado
+                # Validar regex si está especificado (se guarda compilado para reutilizarlo)
                 if "regex" in rule:
                     try:
-                        re.compile(rule["regex"])
+                        rule["_regex_compiled"] = re.compile(rule["regex"])
                     except re.error as e:
                         raise ValueError(
                             f"Regex invalido para {entity}.{field}: {str(e)}"
@@ -91,11 +91,64 @@ class DataValidator:
         regex = rule.get("regex")
         if regex:
             str_value = str(validated_value) if not isinstance(validated_value, datetime) else validated_value.strftime("%Y-%m-%d")
-            if not re.match(regex, str_value):
+            if not rule["_regex_compiled"].match(str_value):
                 return False, None, f"Validacion de regex fallida: {regex}"
         
         return True, validated_value, None
     
+    def _validate_series(self, series: pd.Series, rule: Dict, field: str) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """
+        Valida una columna completa contra una regla (versión vectorizada de _validate_value).
+        Los valores que no tienen equivalente vectorizado exacto pasan por _validate_value.
+        
+        Args:
+            series: Columna a validar (con índice posicional 0..n-1)
+            rule: Diccionario que contiene las reglas de validación
+            field: Nombre del campo (para mensajes de error)
+            
+        Returns:
+            Tupla de (mascara_valida, valores_validados, mensajes_error)
+        """
+        expected_type = rule.get("type")
+        regex = rule.get("regex")
+        
+        valid = pd.Series(True, index=series.index)
+        values = pd.Series([None] * len(series), index=series.index, dtype=object)
+        errors = pd.Series([None] * len(series), index=series.index, dtype=object)
+        slow = pd.Series(False, index=series.index)
+        
+        # Los nulos son válidos y quedan como None
+        present = series[series.notna()]
+        
+        if expected_type == "str":
+            converted = present.astype(str).str.strip()
+        elif expected_type == "date":
+            converted = pd.to_datetime(present.astype(str), format="%Y-%m-%d", errors="coerce")
+            # Lo que no parsea en bloque (formato inválido, fuera de rango) va por el camino lento
+            slow[converted.index[converted.isna()]] = True
+            converted = converted[converted.notna()]
+        elif expected_type is None:
+            converted = present
+        else:
+            # int/float: int() trunca y acepta tipos mixtos, se conserva la validación valor a valor
+            slow[present.index] = True
+            converted = present.iloc[0:0]
+        
+        if regex and len(converted) > 0:
+            text = converted.dt.strftime("%Y-%m-%d") if expected_type == "date" else converted.astype(str)
+            matched = text.str.match(rule["_regex_compiled"]).astype(bool)
+            failed = matched.index[~matched]
+            valid[failed] = False
+            errors[failed] = f"Validacion de regex fallida: {regex}"
+            converted = converted[matched]
+        
+        values[converted.index] = converted.astype(object)
+        
+        for idx in slow.index[slow]:
+            valid[idx], values[idx], errors[idx] = self._validate_value(series[idx], rule, field)
+        
+        return valid, values, errors
+    
     def validate(self, df: pd.DataFrame, entity: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Valida DataFrame según las reglas de la entidad.
@@ -137,47 +190,63 @@ class DataValidator:
             raise ValueError(f"Faltan columnas requeridas para la entidad '{entity}': {missing_required}")
         
         # Inicializar seguimiento
-        validated_data = []
-        discarded_rows = []
-        invalid_by_field = {field: 0 for field in rules.keys()}
         total_input = len(df)
+        invalid_by_field = {field: 0 for field in rules.keys()}
+        positional_df = df.reset_index(drop=True)
+        alive = pd.Series(True, index=positional_df.index)
+        reasons = pd.Series([None] * total_input, index=positional_df.index, dtype=object)
+        validated_columns = {}
         
-        # Validar cada fila
-        for idx, row in df.iterrows():
-            new_row = {}
-            discard_row = False
-            discard_reason = None
+        # Validar columna a columna; como en la validación fila a fila, una fila
+        # descartada por un campo requerido ya no cuenta en los campos siguientes
+        for field, rule in rules.items():
+            if field in positional_df.columns:
+                series = positional_df[field]
+            else:
+                series = pd.Series([None] * total_input, index=positional_df.index, dtype=object)
             
-            for field, rule in rules.items():
-                value = row.get(field, None)
-                is_valid, validated_value, error_msg = self._validate_value(value, rule, field)
-                
-                # Rastrear campos inválidos
-                if not is_valid:
-                    invalid_by_field[field] += 1
-                
-                # Verificar restricción de campo requerido
-                if rule.get("required", False) and (not is_valid or validated_value is None):
-                    discard_row = True
-                    discard_reason = f"Campo requerido '{field}' inválido o faltante"
-                    if error_msg:
-                        discard_reason += f" ({error_msg})"
-                    break
-                
-                new_row[field] = validated_value
+            valid, values, errors = self._validate_series(series, rule, field)
             
-            # Mantener o descartar fila
-            if discard_row:
-                discarded_rows.append({
-                    'original_index': int(idx),
-                    'reason': discard_reason,
-                    'row_data': row.to_dict()
-                })
-            else:
-                validated_data.append(new_row)
+            # Rastrear campos inválidos
+            invalid_by_field[field] += int((~valid & alive).sum())
+            
+            # Verificar restricción de campo requerido
+            if rule.get("required", False):
+                discard = alive & (~valid | values.isna())
+                if discard.any():
+                    reason = f"Campo requerido '{field}' inválido o faltante"
+                    reasons[discard] = [
+                        reason + f" ({error_msg})" if error_msg else reason
+                        for error_msg in errors[discard]
+                    ]
+                    alive &= ~discard
+            
+            validated_columns[field] = values
+        
+        # Filas descartadas, en el orden original
+        keep = alive.to_numpy()
+        dropped = ~keep
+        discarded_rows = [
+            {
+                'original_index': int(original_index),
+                'reason': reason,
+                'row_data': row_data
+            }
+            for original_index, reason, row_data in zip(
+                df.index[dropped],
+                reasons[~alive],
+                positional_df.loc[~alive].to_dict(orient="records")
+            )
+        ]
         
         # Crear DataFrame validado
-        clean_df = pd.DataFrame(validated_data) if validated_data else pd.DataFrame(columns=df.columns)
+        if keep.any():
+            # Una lista por columna con la misma máscara (sin alinear índices por columna)
+            clean_df = pd.DataFrame({
+                field: values.to_numpy()[keep].tolist() for field, values in validated_columns.items()
+            })
+        else:
+            clean_df = pd.DataFrame(columns=df.columns)
         
         # Construir reporte de validación
         validation_report = {
@@ -248,16 +317,14 @@ def run_validation(
         rules_path: Ruta al archivo de reglas JSON
         
     Returns:
-        Tupla de (dataframe_validado, reporte_validacion)
+        Tupla de (columnas_validadas, reporte_validacion), donde las columnas
+        validadas son un dict {columna: lista_de_valores} listo para XCom
     """
     validator = DataValidator(rules_path)
     clean_df, report = validator.validate(df, entity)
 
     # Convertir las fechas a string antes de devolver
-    clean_records = clean_df.to_dict(orient="records")
-    for rec in clean_records:
-        for key, val in rec.items():
-            if isinstance(val, pd.Timestamp):
-                rec[key] = val.strftime("%Y-%m-%d")
+    for col in clean_df.select_dtypes(include=["datetime64"]).columns:
+        clean_df[col] = clean_df[col].dt.strftime("%Y-%m-%d")
 
-    return clean_records, report
+    return clean_df.to_dict(orient="list"), report